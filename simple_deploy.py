@@ -19,6 +19,8 @@
 
 #  I also use this when testing new versions, in order not to have
 #  to generate a local pip for every change.
+#  When src and site-packages are on the same file system, the files
+#  are hard linked, so edits in src/tmux_conf take effect directly.
 #
 
 """Simple deploy
@@ -31,18 +33,104 @@ this directly copies the relevant files into the used site-packages.
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import __main__
 
-a = sys.path
-a.reverse()
+#  Default pipe capacity on Linux, splice can't move more per call
+PIPE_SIZE = 1 << 16
 
+
+def _kernel_copy(s_fd: int, d_fd: int, size: int) -> bool:
+    """Copy size bytes between file descriptors without passing the data
+    through user space. Returns False if no kernel copy method could be used."""
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                copied = os.copy_file_range(s_fd, d_fd, size - offset)
+                if not copied:
+                    break
+                offset += copied
+            return offset >= size
+        except OSError:
+            if offset:
+                return False
+    if hasattr(os, "splice"):
+        try:
+            r, w = os.pipe()
+            try:
+                while offset < size:
+                    filled = os.splice(
+                        s_fd, w, min(size - offset, PIPE_SIZE), offset_src=offset
+                    )
+                    if not filled:
+                        break
+                    offset += filled
+                    while filled:
+                        filled -= os.splice(r, d_fd, filled)
+            finally:
+                os.close(r)
+                os.close(w)
+            return offset >= size
+        except OSError:
+            if offset:
+                return False
+    if hasattr(os, "sendfile") and sys.platform != "win32":
+        try:
+            while offset < size:
+                sent = os.sendfile(d_fd, s_fd, offset, min(size - offset, 1 << 20))
+                if not sent:
+                    break
+                offset += sent
+            return offset >= size
+        except OSError:
+            pass
+    return False
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy src to dst, letting the kernel do the work if possible.
+    Falls back to shutil.copyfile if none of copy_file_range, splice or
+    sendfile is available or supported by the file system.
+
+    If src and dst are on the same file system, dst is hard linked to src,
+    so no data is copied at all. This means later edits to src are seen
+    directly in the deployed copy, until deployed again.
+
+    The new file is prepared under a temp name next to dst, and then
+    replaces dst, so dst is never removed up front. If dst already is src,
+    such as when site-packages links to this repo, nothing is done.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            #  cross device or links not supported, do a real copy
+            with open(src, "rb") as s, open(tmp, "wb") as d:
+                copied = _kernel_copy(s.fileno(), d.fileno(), os.fstat(s.fileno()).st_size)
+            if not copied:
+                shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+HOME = os.environ.get("HOME", "")
 SP = "site-packages"
 
-for p in sys.path[:-1]:
-    if p.find(os.getenv("HOME") or "") < 0:
-        continue
-    if len(p) - len(SP) == p.rfind(SP):
+#  Search user paths last to first, skipping sys.path[0] - the script dir
+for p in reversed(sys.path[1:]):
+    if not HOME or HOME not in p:
+        continue  # not a user path
+    if p.endswith(SP):
         print(f"Checking {p}")
         # chdir to this location to make relative paths work
         os.chdir(os.path.dirname(__main__.__file__))
@@ -53,14 +141,21 @@ for p in sys.path[:-1]:
         if not os.path.isdir(DIR_DEST):
             print(f"ERROR: dir {DIR_DEST} does not exist!")
             sys.exit(1)
-        shutil.copy(f"{DIR_SRC}/__init__.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/constants.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/embedded_scripts.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/plugins.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/tmux_conf.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/utils.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/vers_check.py", DIR_DEST)
-        shutil.copy(f"{DIR_SRC}/exceptions.py", DIR_DEST)
+        #  Deploy all modules, so this doesn't need updating as files are added
+        with os.scandir(DIR_SRC) as it:
+            srcs = [e for e in it if e.name.endswith(".py") and e.is_file()]
+        #
+        #  The copies are independent and I/O bound, so overlap them.
+        #  Keep the pool small, more threads would just thrash slow nodes
+        #
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(
+                ex.map(
+                    _fast_copy,
+                    [e.path for e in srcs],
+                    [f"{DIR_DEST}/{e.name}" for e in srcs],
+                )
+            )
         print(f"Copied tmux_conf files to user {DIR_DEST}")
         sys.exit(0)
     else:
@@ -12,15 +12,45 @@
 
 """Class that handles embedded scripts"""
 
+import functools
+import io
 import os
-import pathlib
 import stat
 import sys
 
 from .constants import XDG_CONFIG_HOME
+from .exceptions import TmuxConfScriptEmitError
 from .utils import run_shell, tilde_home_dir
 from .vers_check import VersionCheck
 
+_EXEC_BITS = stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH
+
+#  Linux and macOS both limit writev() to 1024 buffers per call
+_IOV_MAX = 1024
+
+
+def _writev_all(fd: int, bufs: list[bytes]) -> None:
+    """Write all bufs to fd, handing the kernel as many as possible per call"""
+    i = 0
+    while i < len(bufs):
+        end = i + _IOV_MAX
+        written = os.writev(fd, bufs[i:end])
+        while written and written >= len(bufs[i]):
+            written -= len(bufs[i])
+            i += 1
+        if written:
+            #  Partial write, resume from where it stopped
+            bufs[i] = bufs[i][written:]
+
+
+@functools.lru_cache(maxsize=1)
+def _find_bash() -> str:
+    """Full path to bash"""
+    bash_shell = run_shell("command -v bash")
+    if not bash_shell:
+        sys.exit("Failed to find bash!")
+    return bash_shell
+
 
 class EmbeddedScripts:
     """Handles scripts, either embedded or stored in scripts/ as external"""
@@ -29,16 +59,18 @@ class EmbeddedScripts:
         self, conf_file: str, vers_class: VersionCheck, use_embedded_scripts: bool
     ) -> None:
         #  Ensure conf file is using ~ or full path if ~ not applicable
+        if not conf_file.startswith(("~", "/")):
+            conf_file = os.path.join(os.getcwd(), conf_file)
         conf_file = tilde_home_dir(conf_file)
-        if conf_file[0] not in ("~", "/"):
-            conf_file = tilde_home_dir(os.path.join(os.getcwd(), conf_file))
         self._conf_file = conf_file
         self._vers = vers_class
         self._use_embedded_scripts = use_embedded_scripts
-        self._scripts: list[str] = []
+        self._scripts = io.StringIO()
         self.defined_scripts: list[str] = []
-        self._bash_scripts: list[str] = []
-        self._bash_shell = ""  # Will only be set if needed
+        self._defined_set: set[str] = set()  # for membership tests
+        self._bash_scripts: set[str] = set()
+        self._bg_supported = vers_class.is_ok(1.8)
+        self._embed_prefix = f"cut -c3- {conf_file} | "
 
     def create(
         self,
@@ -50,6 +82,9 @@ class EmbeddedScripts:
         """Creates a script, supplied as a list of lines
         script lines can be regular lines as string, or multi-line strings
 
+        For external scripts the list is altered in place, so callers
+        that reuse their lines should hand over a new list each time.
+
         built_in is set to True for scripts generated in this pip
         then it is checked if such a script has already been created by
         code using this, and if the scr_name has been used, this instance
@@ -66,20 +101,37 @@ class EmbeddedScripts:
 
         depending on self._use_embedded_scripts
         """
-        if built_in is False:
+        if not built_in:
             self.defined_scripts.append(scr_name)
-        else:
-            #  Allow users to override default scripts
-            if scr_name in self.defined_scripts:
-                return
+            self._defined_set.add(scr_name)
+        elif scr_name in self._defined_set:
+            return  # Allow users to override default scripts
         if self._use_embedded_scripts:
             if use_bash:
-                self._bash_scripts.append(scr_name)
-            self._scripts += script
-            self._scripts.append("")  # separator between scripts
+                self._bash_scripts.add(scr_name)
+            lines = []
+            for script_line in script:
+                if "\n" in script_line:
+                    #
+                    #  Was multi-line string, remove first and last lines if empty
+                    #
+                    if script_line[0] == "\n":
+                        script_line = script_line[1:]
+                        if not script_line:
+                            continue  # was just a single empty line
+                    if script_line[-1] == "\n":
+                        script_line = script_line[:-1]
+                lines.append(script_line)
+            lines.append("\n")  # separator between scripts
+            self._scripts.write("\n".join(lines))
         else:
-            script_dir = self.get_dir()
-            os.makedirs(script_dir, exist_ok=True)
+            script_dir = self.scripts_dir
+            try:
+                os.makedirs(script_dir, exist_ok=True)
+            except OSError as error:
+                raise TmuxConfScriptEmitError(
+                    script_dir, "Failed to create scripts dir"
+                ) from error
             if use_bash:
                 shebang = "#!/usr/bin/env bash"
             else:
@@ -88,49 +140,46 @@ class EmbeddedScripts:
             script.insert(0, f"{shebang}\n")
             script.append(f'{scr_name} "$@"')  # trigger it to run without a param
 
-            fname = f"{script_dir}/{scr_name}.sh"
-            with open(fname, "w", encoding="utf-8") as f:
-                for line in script:
-                    f.write(f"{line}\n")
-
-            #  Make it run able
-            f2 = pathlib.Path(fname)
-            f2.chmod(f2.stat().st_mode | stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
+            fname = f"{self.scripts_dir}/{scr_name}.sh"
+            try:
+                fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+                try:
+                    _writev_all(fd, [f"{line}\n".encode("utf-8") for line in script])
+
+                    #  Make it run able, O_CREAT mode is not applied to existing files
+                    mode = os.fstat(fd).st_mode
+                    if mode & _EXEC_BITS != _EXEC_BITS:
+                        os.fchmod(fd, mode | _EXEC_BITS)
+                finally:
+                    os.close(fd)
+            except OSError as error:
+                raise TmuxConfScriptEmitError(fname) from error
 
     def run_it(self, scr_name: str, in_bg: bool = False) -> str:
         """Generate the code to run an embedded/external script"""
-        cmd = "run-shell "
-        if self._vers.is_ok(1.8) and in_bg:
-            cmd += "-b "
-        cmd += '"'
         if self._use_embedded_scripts:
-            cmd += f"cut -c3- {self._conf_file} | "
             if scr_name in self._bash_scripts:
-                if not self._bash_shell:
-                    bash_shell = run_shell("command -v bash")
-                    if not bash_shell:
-                        sys.exit("Failed to find bash!")
-                    self._bash_shell = bash_shell
-                cmd += self._bash_shell
+                shell = _find_bash()
             else:
-                cmd += "sh"
-            cmd += f" -s {scr_name}"
+                shell = "sh"
+            script = f"{self._embed_prefix}{shell} -s {scr_name}"
         else:
-            cmd += f"{self.get_dir()}/{scr_name}.sh"
-        cmd += '"'
-        return cmd
+            script = f"{self.scripts_dir}/{scr_name}.sh"
+        if in_bg and self._bg_supported:
+            return f'run-shell -b "{script}"'
+        return f'run-shell "{script}"'
 
     def call_script(self, scr_name: str) -> str:
         """call a script"""
         cmd = scr_name
         if not self._use_embedded_scripts:
-            cmd = f"{self.get_dir()}/{scr_name}.sh"
+            cmd = f"{self.scripts_dir}/{scr_name}.sh"
         return cmd
 
     def content(self):
         """Generates the code for embedded scripts to be written to
         the conf file"""
-        if not (self._use_embedded_scripts and self._scripts):
+        if not (self._use_embedded_scripts and self._scripts.tell()):
             return []
 
         output = [
@@ -142,29 +191,23 @@ class EmbeddedScripts:
         ]
         #
         #  Embedded scripts starts at column 3, insert extra indentation on
-        #  each line
+        #  each line. Let str.replace() and str.split() do the per line work,
+        #  the last char is the final line's newline, so it is skipped
         #
-        for script_line in self._scripts:
-            mutlilines = script_line.split("\n")
-            if len(mutlilines) > 1:
-                #
-                #  Was multi-line string, remove first and last lines if empty
-                #
-                if not mutlilines[0]:
-                    mutlilines.pop(0)
-                if not mutlilines[-1]:
-                    mutlilines.pop(-1)
-                for line in mutlilines:
-                    output.append(f"# {line}")
-            else:
-                output.append(f"# {script_line}")
+        body = self._scripts.getvalue()[:-1]
+        output += ("# " + body.replace("\n", "\n# ")).split("\n")
         output.append('# "$@" #  This triggers the embedded script')
         return output
 
     def get_dir(self) -> str:
         """Retrieves the location where scripts should be saved"""
+        return self.scripts_dir
+
+    @functools.cached_property
+    def scripts_dir(self) -> str:
+        """Location where scripts should be saved"""
         if self._use_embedded_scripts:
-            raise SyntaxError("get_dir() called when use_embedded_scripts is True")
+            raise SyntaxError("scripts_dir used when use_embedded_scripts is True")
 
         if tilde_home_dir(self._conf_file) == "~/.tmux.conf":
             scripts_dir = os.path.expanduser("~/.tmux/scripts")
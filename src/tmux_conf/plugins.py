@@ -11,13 +11,15 @@
 
 """Class that handles tmux plugins"""
 
+import functools
+import operator
 import os
 import shutil
 import sys
 
 # pylint: disable=import-error
 from collections.abc import Callable
-from dataclasses import dataclass
+from typing import NamedTuple
 
 import __main__
 
@@ -25,13 +27,102 @@ from .constants import XDG_CONFIG_HOME
 from .embedded_scripts import EmbeddedScripts
 from .vers_check import VersionCheck
 
-PLUGIN_VERS_MIN = 0
-PLUGIN_MTHD = 1
-PLUGIN_STATIC_CODE = 2
 
+class PluginInfo(NamedTuple):
+    """A used plugin, code_lines is its static code as stripped lines"""
 
-@dataclass
-class Plugin:
+    vers_min: str
+    method: Callable[[], list[str]]
+    code_lines: tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=4)
+def _activate_manually_sh(fnc_name: str, plugins_dir: str, plugins: str) -> str:
+    """Shell function installing and initializing plugins without tpm"""
+    return f"""
+#
+#  This is a manual plugin handler, does not scan for items.
+#  The plugins list must be altered manually
+#
+{fnc_name}() {{
+    mkdir -p "{plugins_dir}"
+
+    plugins=( {plugins} )
+    for plugin in "${{plugins[@]}}"; do
+        name="$(echo "$plugin" | cut -d / -f2)"
+        if [[ ! -d "{plugins_dir}/$name" ]]; then
+            $TMUX_BIN display "cloning  $name"
+            git clone "https://github.com/$plugin" "{plugins_dir}/$name"
+        fi
+        #  argh, handle softlinks to plugin folders, in order to find init...
+        d_plugin_folder="$(realpath "{plugins_dir}/$name")"
+        init_script="$(find "$d_plugin_folder" -maxdepth 1 | grep tmux$ | head -n 1)"
+        if [[ -n "$init_script" ]]; then
+            $TMUX_BIN display "running: $init_script"
+            $init_script || $TMUX_BIN display "ERROR in $init_script"
+        else
+            $TMUX_BIN display "Could not find init for plugin: $name"
+            sleep 2
+        fi
+    done
+}}"""
+
+
+@functools.lru_cache(maxsize=4)
+def _activate_tpm_sh(
+    fnc_name: str, plugin_handler: str, plugins_dir: str, tpm_env: str
+) -> str:
+    """Shell function starting tpm, installing it first if need be"""
+    tpm_location = os.path.join(plugins_dir, "tpm")
+    tpm_app = os.path.join(tpm_location, "tpm")
+    return f"""
+{fnc_name}() {{
+    #
+    #  Initialize already installed tpm if found
+    #
+    if [ -x "{tpm_app}" ]; then
+        {tpm_env}{tpm_app}
+        exit 0
+    fi
+
+    #  Create plugin dir if needed
+    mkdir -p "{plugins_dir}"
+
+    #  Remove potentially broken tpm install
+    rm -rf "{tpm_location}"
+
+    $TMUX_BIN display "Cloning {plugin_handler} into {tpm_location} ..."
+    git clone https://github.com/{plugin_handler} "{tpm_location}"
+    if [ "$?" -ne 0 ]; then
+        echo "Failed to clone tmux plugin handler:"
+        echo "  https://github.com/{plugin_handler}"
+        exit 11
+    fi
+
+    $TMUX_BIN display "Running cloned tpm..."
+    {tpm_env}"{tpm_app}"
+    if [ "$?" -ne 0 ]; then
+        echo "Failed to run: {tpm_app}"
+        exit 12
+    fi
+
+    #
+    #  this only triggers plugins install if tpm needed to be installed.
+    #  Otherwise installing missing plugins is delegated to tpm.
+    #  Default trigger is: <prefix> I
+    #
+    $TMUX_BIN display "Installing all plugins..."
+    {tpm_env}"{tpm_location}/bindings/install_plugins"
+    if [ "$?" -ne 0 ]; then
+        echo "Failed to run: {tpm_location}/bindings/install_plugins"
+        exit 12
+    fi
+
+    $TMUX_BIN display "Plugin setup completed"
+}}"""
+
+
+class Plugin(NamedTuple):
     """Handles tmux plugins"""
 
     vers_min: str
@@ -82,8 +173,10 @@ class Plugins:
         self._plugin_handler = plugin_handler
 
         self._is_limited_host = False
+        self._env: tuple[str, str] = ("", "")  # Will be set on first get_env()
 
-        self._used_plugins: dict[str, tuple[str, Callable[[], list[str]], str]] = {}
+        self._used_plugins: dict[str, PluginInfo] = {}
+        self._max_name_len = 0  # longest used plugin name, with padding
 
         # plugins incompatible with this version
         self._skipped_plugins: list[tuple[str, str]] = []
@@ -119,15 +212,10 @@ class Plugins:
         when just checking if a given plugin is used in most cases.
         Since if a different fork of it is being used, the name would
         not match."""
-        result = []
-        for full_name in self._used_plugins:
-            name = full_name
-            if short_name:
-                # Try to return only actual plugin name, without provider
-                if full_name.find("/") > -1:
-                    name = full_name.split("/")[1]
-            result.append(name)
-        return result
+        if not short_name:
+            return list(self._used_plugins)
+        # Try to return only actual plugin name, without provider
+        return [full_name.rpartition("/")[2] for full_name in self._used_plugins]
 
     def get_plugin_dir(self) -> str:
         """Returns dir where plugins will be installed."""
@@ -154,56 +242,57 @@ class Plugins:
         """Investigate all defined plugin methods, and determine if a
         given plugin can be used depending on running tmux, or if it should be skipped
         """
-        duplicate_check = []
+        duplicate_check: set[str] = set()
         for plugin_mthd in plugin_methods:
             plugin_name, vers_min, code = plugin_mthd()
             if plugin_name in duplicate_check:
                 print(f'ERROR: plugin "{plugin_name}" defined more than once:')
                 sys.exit(1)
-            else:
-                duplicate_check.append(plugin_name)
+            duplicate_check.add(plugin_name)
             #  Since plugin method might define vers_min as a float or int
             #  it needs to be converted to a string for plugin handling
             s_vers_min = str(vers_min)
             if s_vers_min in ("-1", "-1.0"):
                 continue  # skip it entirely
             if self._vers.is_ok(s_vers_min):
-                self._used_plugins[plugin_name] = (
-                    s_vers_min,  # PLUGIN_VERS_MIN
-                    plugin_mthd,  # PLUGIN_MTHD
-                    code,  # PLUGIN_STATIC_CODE
+                self._used_plugins[plugin_name] = PluginInfo(
+                    s_vers_min,
+                    plugin_mthd,
+                    tuple(line.strip() for line in code.split("\n")),
                 )
+                self._max_name_len = max(self._max_name_len, len(plugin_name) + 2)
             else:
                 self._skipped_plugins.append((s_vers_min, plugin_name))
-        self._skipped_plugins.sort()
 
     # pylint: disable=too-many-branches
     def display_info(self) -> str:
-        """List selected and ignored plugins, depending on param"""
-        print(f"\n\t=====  tmux {self._vers.get()} - Plugins defined  =====")
-        print(f" for: {__main__.__file__}")
+        """List selected and ignored plugins, depending on param
 
-        #
-        #  First loop to find longest plugin name
-        #
-        max_l_name = 0
-        for name in self._used_plugins:
-            max_l_name = max(max_l_name, len(name) + 2)
+        Output is collected and written in one go, only flushed early
+        when plugin code is run, since it might print on its own.
+        """
+        used = self._used_plugins
+        skipped = self._skipped_plugins
+        lines = [
+            f"\n\t=====  tmux {self._vers.get()} - Plugins defined  =====",
+            f" for: {__main__.__file__}",
+        ]
+
+        max_l_name = self._max_name_len  # Tracked by scan()
 
-        if self._used_plugins:
-            print("\n\t-----   Plugins used   -----")
-            print(f'{"Plugin":<{max_l_name}}|  Min version')
+        if used:
+            lines.append("\n\t-----   Plugins used   -----")
+            lines.append(f'{"Plugin":<{max_l_name}}|  Min version')
 
         #
-        #  Create list of items in plugins dir
+        #  Create set of items in plugins dir, softlinked plugin folders
+        #  are valid, so is_dir() should follow links
         #
-        # plugin_items = next(os.walk(self.get_plugin_dir()))[1]
-        plugin_items = []
-        plugin_dir = self.get_plugin_dir()
-        if os.path.exists(plugin_dir):
-            for f in os.scandir(plugin_dir):
-                if f.is_dir():
-                    plugin_items.append((f.path.split("/")[-1]))
+        try:
+            with os.scandir(self.get_plugin_dir()) as it:
+                plugin_items = {f.name for f in it if f.is_dir()}
+        except FileNotFoundError:
+            plugin_items = set()
         _ = self._remove_if_found(plugin_items, "tpm")
 
         #
@@ -212,62 +301,56 @@ class Plugins:
         #  plugin details, no need to reset this variable.
         #
         verbose = self._plugins_display == 3
+        if verbose:
+            line_fmt = f"> {{:<{max_l_name - 2}}} - {{}} {{}}"
+        else:
+            line_fmt = f"{{:<{max_l_name}}} - {{}} {{}}"
 
-        for name, info in self._used_plugins.items():
+        for name, (vers_min, method, code_lines) in used.items():
+            inner_name = self._name_sans_prefix(name)
+            suffix = self._remove_if_found(
+                plugin_items, inner_name, " *** Not installed ***"
+            )
             if verbose:
-                inner_name = self._name_sans_prefix(name)
-                suffix = self._remove_if_found(
-                    plugin_items, inner_name, " *** Not installed ***"
-                )
-                print("".ljust(len(inner_name) + 2, "-"))
-                print(
-                    f"> {inner_name:<{max_l_name - 2}} - "
-                    f"{info[PLUGIN_VERS_MIN]} {suffix}"
-                )
-                info[1]()  # PLUGIN_MTHD
+                lines.append("-" * (len(inner_name) + 2))
+                lines.append(line_fmt.format(inner_name, vers_min, suffix))
+                self._write_lines(lines)
+                method()
                 #
                 #  Skip indentation, for easier read
                 #
-                for line in info[2].split("\n"):  # PLUGIN_STATIC_CODE
-                    # if line == line.strip():
-                    print(f"{line.strip()}")
-                # print()
+                lines.extend(code_lines)
             else:
-                inner_name = self._name_sans_prefix(name)
-                suffix = self._remove_if_found(
-                    plugin_items, inner_name, " *** Not installed ***"
-                )
-                print(f"{inner_name:<{max_l_name}} - {info[PLUGIN_VERS_MIN]} {suffix}")
+                lines.append(line_fmt.format(inner_name, vers_min, suffix))
 
         #  Remove skipped plugins from plugin_items
-        for _, name in self._skipped_plugins:
+        for _, name in skipped:
             inner_name = self._name_sans_prefix(name)
             _ = self._remove_if_found(plugin_items, inner_name)
 
         if plugin_items:
-            print("\n-----   Unused plugins found   -----")
-            for s in plugin_items:
-                print("\t", s)
+            lines.append("\n-----   Unused plugins found   -----")
+            lines.extend(f"\t {s}" for s in sorted(plugin_items))
 
-        if not self._skipped_plugins or self._plugins_display != 2:
+        if not skipped or self._plugins_display != 2:
+            self._write_lines(lines)
             sys.exit(0)
 
-        if self._skipped_plugins:
-            print()
-
         #
         #  List all plugins installed, but not used
         #
-        max_l_v = 0
-        self._skipped_plugins.sort()
-        for vers, name in self._skipped_plugins:
-            max_l_v = max(max_l_v, len(vers))
-        print("-----   Plugins ignored   -----")
-        print(f'{"Min":<{max_l_v}}|{" Plugin name":<{max_l_name}}')
-        print(f'{"vers":<{max_l_v}}|\n')
-        for vers, name in self._skipped_plugins:
-            print(f"{vers:>{max_l_v}}  {name:<{max_l_name}}")
-
+        #  Only sorted here, since it is rarely displayed. Plugins needing
+        #  the same version are kept in the order they were defined
+        skipped.sort(key=operator.itemgetter(0))
+        max_l_v = max((len(vers) for vers, _ in skipped), default=0)
+        lines += [
+            "",
+            "-----   Plugins ignored   -----",
+            f'{"Min":<{max_l_v}}|{" Plugin name":<{max_l_name}}',
+            f'{"vers":<{max_l_v}}|\n',
+        ]
+        lines.extend(f"{vers:>{max_l_v}}  {name:<{max_l_name}}" for vers, name in skipped)
+        self._write_lines(lines)
         sys.exit(0)
 
     def parse(self):
@@ -293,29 +376,32 @@ class Plugins:
             return []
 
         output = []
+        at_vars_ok = self._vers.is_ok("1.8")
 
-        #
-        #  First ensure that plugin code that needs to process the
-        #  environment is done and output is written to config.
-        #
-        for name, info in self._used_plugins.items():
-            info[1]()
+        for name, (_, method, code_lines) in self._used_plugins.items():
+            #
+            #  Run plugin code that needs to process the environment,
+            #  anything it writes goes directly to the config, ahead of
+            #  the output collected here.
+            #
+            method()
 
-        #
-        #  Add plugin references and hard coded plugin settings.
-        #
-        for name, info in self._used_plugins.items():
-            output.append("#------------------------------")
-            if self._vers.is_ok("1.8"):
-                output.append(f'set -g @plugin "{name}"')
-                for line in info[2].split("\n"):
-                    output.append(line.strip())
+            #
+            #  Add plugin references and hard coded plugin settings.
+            #
+            if at_vars_ok:
+                output += [
+                    "#------------------------------",
+                    f'set -g @plugin "{name}"',
+                    *code_lines,
+                ]
             else:
                 #  prior to 1.8, any variables starting wiith @ would get tmux
                 #  stuck parsing the config file, so plugins without any such
                 #  setting could be handled by activate_plugins_mamually()
                 #  This is such a rare edge case that it is not worh handling
                 output += [
+                    "#------------------------------",
                     f"# plugin: {name}",
                     "# in versions < 1.8 @variables can not be used",
                     "",
@@ -340,17 +426,20 @@ class Plugins:
 
     def get_env(self) -> tuple[str, str]:
         """get environment"""
+        if self._env[0]:
+            return self._env
+
+        home_dir = os.path.expanduser("~")
         location = os.path.dirname(os.path.expanduser(self._conf_file))
-        if location == os.path.expanduser("~"):
+        if location == home_dir:
             #
             #  If conf file is default, plugins have a non standard location
             #
-            if self._conf_file.find("tmate") > -1:
-                plugins_dir = os.path.expanduser("~/.tmate/plugins")
-                tpm_env = ""
+            if "tmate" in self._conf_file:
+                plugins_dir = os.path.join(home_dir, ".tmate", "plugins")
             else:
-                plugins_dir = os.path.expanduser("~/.tmux/plugins")
-                tpm_env = ""
+                plugins_dir = os.path.join(home_dir, ".tmux", "plugins")
+            tpm_env = ""
         else:
             xdg_home = os.environ.get(XDG_CONFIG_HOME)
             if xdg_home:
@@ -359,58 +448,28 @@ class Plugins:
                 conf_base = os.path.dirname(location)
 
             plugins_dir = os.path.join(conf_base, "tmux", "plugins")
-            tpm_env = os.path.expanduser(f'XDG_CONFIG_HOME="{conf_base}" ')
+            tpm_env = f'XDG_CONFIG_HOME="{conf_base}" '
 
-        return plugins_dir, tpm_env
+        self._env = (plugins_dir, tpm_env)
+        return self._env
 
-    def mkscript_manual_deploy(self):
+    def mkscript_manual_deploy(self) -> str:
         """This script is run as tmux starts, all non-present
         plugins are installed, and an attempt is done to initialize
         each plugin.
         """
-        output = []
-        output.append(
-            """
+        output = """
         #======================================================
         #
         #   Manual Plugin Handling
         #
         #======================================================
         """
-        )
         plugins_dir, _ = self.get_env()
-        plugins = ""
-        for p in self.installed(short_name=False):
-            plugins += " " + p
+        plugins = " ".join(self.installed(short_name=False))
 
         activate_manually_sh = [
-            f"""
-#
-#  This is a manual plugin handler, does not scan for items.
-#  The plugins list must be altered manually
-#
-{self._fnc_activate_manually}() {{
-    mkdir -p "{plugins_dir}"
-
-    plugins=({plugins} )
-    for plugin in "${{plugins[@]}}"; do
-        name="$(echo "$plugin" | cut -d / -f2)"
-        if [[ ! -d "{plugins_dir}/$name" ]]; then
-            $TMUX_BIN display "cloning  $name"
-            git clone "https://github.com/$plugin" "{plugins_dir}/$name"
-        fi
-        #  argh, handle softlinks to plugin folders, in order to find init...
-        d_plugin_folder="$(realpath "{plugins_dir}/$name")"
-        init_script="$(find "$d_plugin_folder" -maxdepth 1 | grep tmux$ | head -n 1)"
-        if [[ -n "$init_script" ]]; then
-            $TMUX_BIN display "running: $init_script"
-            $init_script || $TMUX_BIN display "ERROR in $init_script"
-        else
-            $TMUX_BIN display "Could not find init for plugin: $name"
-            sleep 2
-        fi
-    done
-}}""",
+            _activate_manually_sh(self._fnc_activate_manually, plugins_dir, plugins)
         ]
         self._es.create(
             self._fnc_activate_manually,
@@ -420,71 +479,24 @@ class Plugins:
         )
         return output
 
-    def mkscript_tpm_deploy(self):
+    def mkscript_tpm_deploy(self) -> str:
         """If tpm is present, it is started.
         If not, it is installed and requested to install all
         defined plugins.
         """
-        output = []
-        output.append(
-            """
+        output = """
         #======================================================
         #
         #   Tmux Plugin Manager
         #
         #======================================================
         """
-        )
         #  os.makedirs(plugins_dir, exist_ok=True)
         plugins_dir, tpm_env = self.get_env()
-        tpm_location = os.path.join(plugins_dir, "tpm")
-        tpm_app = os.path.join(tpm_location, "tpm")
         activate_tpm_sh = [
-            f"""
-{self._fnc_activate_tpm}() {{
-    #
-    #  Initialize already installed tpm if found
-    #
-    if [ -x "{tpm_app}" ]; then
-        {tpm_env}{tpm_app}
-        exit 0
-    fi
-
-    #  Create plugin dir if needed
-    mkdir -p "{plugins_dir}"
-
-    #  Remove potentially broken tpm install
-    rm -rf "{tpm_location}"
-
-    $TMUX_BIN display "Cloning {self._plugin_handler} into {tpm_location} ..."
-    git clone https://github.com/{self._plugin_handler} "{tpm_location}"
-    if [ "$?" -ne 0 ]; then
-        echo "Failed to clone tmux plugin handler:"
-        echo "  https://github.com/{self._plugin_handler}"
-        exit 11
-    fi
-
-    $TMUX_BIN display "Running cloned tpm..."
-    {tpm_env}"{tpm_app}"
-    if [ "$?" -ne 0 ]; then
-        echo "Failed to run: {tpm_app}"
-        exit 12
-    fi
-
-    #
-    #  this only triggers plugins install if tpm needed to be installed.
-    #  Otherwise installing missing plugins is delegated to tpm.
-    #  Default trigger is: <prefix> I
-    #
-    $TMUX_BIN display "Installing all plugins..."
-    {tpm_env}"{tpm_location}/bindings/install_plugins"
-    if [ "$?" -ne 0 ]; then
-        echo "Failed to run: {tpm_location}/bindings/install_plugins"
-        exit 12
-    fi
-
-    $TMUX_BIN display "Plugin setup completed"
-}}""",
+            _activate_tpm_sh(
+                self._fnc_activate_tpm, self._plugin_handler, plugins_dir, tpm_env
+            )
         ]
         self._es.create(self._fnc_activate_tpm, activate_tpm_sh, built_in=True)
         return output
@@ -505,21 +517,44 @@ class Plugins:
                 + f"plugin dir: [{plugins_dir}]"
             )
 
-        if not os.path.exists(plugins_dir):
+        try:
+            with os.scandir(plugins_dir) as it:
+                entries = list(it)
+        except FileNotFoundError:
             return  # nothing to clear
+        if not entries:
+            return
+        for entry in entries:
+            print(f"removing plugin {entry.name}")
+        #
+        #  Plugins are independent of each other, and removing them is
+        #  I/O bound, so do it in parallel. Clearing is rare, so the
+        #  thread pool is only imported when needed.
+        #
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(8, len(entries))) as ex:
+            list(ex.map(self._remove_entry, entries))
+
+    def _remove_entry(self, entry: os.DirEntry[str]) -> None:
+        #  Only descend into real dirs, softlinked plugins just lose the link
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.remove(entry.path)
 
-        for file_name in os.listdir(plugins_dir):
-            path = os.path.join(plugins_dir, file_name)
-            print(f"removing plugin {file_name}")
-            shutil.rmtree(path)
+    def _write_lines(self, lines: list[str]) -> None:
+        """Write collected lines to stdout and empty the list"""
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
 
     def _name_sans_prefix(self, name: str) -> str:
-        if name.find("/") > -1:
-            name = name.split("/")[1]
-        return name
+        return name.rpartition("/")[2]
 
-    def _remove_if_found(self, lst: list[str], item: str, warning: str = "") -> str:
-        if item in lst:
-            lst.remove(item)
+    def _remove_if_found(self, items: set[str], item: str, warning: str = "") -> str:
+        if item in items:
+            items.discard(item)
             warning = ""
         return warning
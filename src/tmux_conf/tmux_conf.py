@@ -16,10 +16,14 @@
 """Class that generates a .tmux.conf"""
 
 # from datetime import datetime
+import contextlib
 import datetime
+import functools
 import os
 import shutil
 import sys
+from collections.abc import Iterator
+from typing import Optional, TextIO
 
 import __main__
 
@@ -38,6 +42,18 @@ from .utils import (
 from .vers_check import VersionCheck
 
 
+@functools.lru_cache(maxsize=8)
+def _command_path(cmd: str) -> str:
+    """Output of command -v for cmd"""
+    return run_shell(f"command -v {cmd}")
+
+
+@functools.lru_cache(maxsize=1)
+def _hostname() -> str:
+    """Name of this host, as shown in the conf file header"""
+    return run_shell("hostname").strip()
+
+
 # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-public-methods
 class TmuxConfig:
     """Class that generates a .tmux.conf"""
@@ -115,7 +131,7 @@ class TmuxConfig:
 
         #  can't use self.is_tmate() at this point, since self.tmux_bin
         #  is not yet set
-        if tmux_bin.find("tmate") > -1:
+        if "tmate" in tmux_bin:
             #  Set tmate defaults
             if not tmux_version:
                 tmux_version = "2.4"
@@ -130,6 +146,8 @@ class TmuxConfig:
 
         self.e_c_has_been_called = False
         self._write_stdout = False
+        #  Kept open while the config is generated, see write()
+        self._conf_fh: Optional[TextIO] = None
 
         print(f"Processing: {__main__.__file__}")
 
@@ -278,7 +296,7 @@ class TmuxConfig:
         #  things will fail. If that turns out to be an issue, I guess
         #  storing the "right" python in the conf file would be a solution.
         #
-        py_bin = run_shell("command -v python3")
+        py_bin = _command_path("python3")
 
         w(
             f'bind -N "Edit local config files"  {edit_key}  '
@@ -328,41 +346,42 @@ class TmuxConfig:
 
         self.conf_file_header()
 
-        self.content()
-        #
-        #  check the edit_config() header in this class for hints on
-        #  how to override the edit key
-        #
-        self.edit_config()
-        if self.plugin_handler and self.plugins.installed():
-            w(
-                """#======================================================
+        with self._conf_file_kept_open():
+            self.content()
             #
-            #   Plugins
+            #  check the edit_config() header in this class for hints on
+            #  how to override the edit key
             #
-            # ======================================================\n"""
-            )
-            for line in self.plugins.parse():
-                if isinstance(line, list):
-                    for sub_line in line:
-                        self.write(sub_line)
-                else:
-                    self.write(line)
-
-        self.local_overrides()
-        #
-        #  Should be called as late as possible, to be able to have
-        #  gathered all the intended embedded scripts.
-        #
-        for line in self.es.content():
-            self.write(line)
+            self.edit_config()
+            if self.plugin_handler and self.plugins.installed():
+                w(
+                    """#======================================================
+                #
+                #   Plugins
+                #
+                # ======================================================\n"""
+                )
+                for line in self.plugins.parse():
+                    if isinstance(line, list):
+                        for sub_line in line:
+                            self.write(sub_line)
+                    else:
+                        self.write(line)
+
+            self.local_overrides()
+            #
+            #  Should be called as late as possible, to be able to have
+            #  gathered all the intended embedded scripts.
+            #
+            for line in self.es.content():
+                self.write(line)
 
     def list_plugin_methods(self):  # -> list[Callable[[], list[str]]]:
         """Support for plugins.py, provides a list of all plugin_... methods"""
         plugin_mthds = []
         if self.plugin_handler:
             for item in dir(self):
-                if item.find("plugin_") or item == "plugin_handler":
+                if not item.startswith("plugin_") or item == "plugin_handler":
                     continue
                 plugin_mthds.append(getattr(self, item))
         return plugin_mthds
@@ -397,7 +416,7 @@ class TmuxConfig:
         #
         #      Creation time: {datetime.datetime.now().strftime("%y-%m-%d %H:%M:%S")}
         #          tmux-conf: {self.lib_version}
-        #         Created on: {run_shell('hostname').strip()}"""
+        #         Created on: {_hostname()}"""
         )
         if self.vers.get() != self.vers.get_actual():  # type: ignore
             w(f"#     actual version: ({self.vers.get_actual()})")
@@ -449,31 +468,53 @@ class TmuxConfig:
         #
         #  Convert to lines actually to be written
         #
-        lines: list[str] = []
-        for raw_line in cmd.split("\n"):
-            #
-            #  Returns a list of lines. If input contained a -N and notes
-            #  are not supported by this tmux, the note is extracted and
-            #  the following is returned.
-            #  self.use_notes_as_comments = True
-            #   - empty string, vertical spacer
-            #   - note as a comment
-            #   - the remainder of the initial line
-            #  self.use_notes_as_comments = False
-            #   - the remainder of the initial line
-            #
-            for line in self.filter_note(raw_line.strip()):
-                lines.append(line)
+        if "-N" not in cmd or (self.vers_ok("3.1") and self.use_notes_as_comments):
+            #  Nothing to filter, which is the case for most writes
+            lines = [raw_line.strip() for raw_line in cmd.split("\n")]
+        else:
+            lines = []
+            for raw_line in cmd.split("\n"):
+                #
+                #  Returns a list of lines. If input contained a -N and notes
+                #  are not supported by this tmux, the note is extracted and
+                #  the following is returned.
+                #  self.use_notes_as_comments = True
+                #   - empty string, vertical spacer
+                #   - note as a comment
+                #   - the remainder of the initial line
+                #  self.use_notes_as_comments = False
+                #   - the remainder of the initial line
+                #
+                lines.extend(self.filter_note(raw_line.strip()))
 
-        with open(self.conf_file, "a", encoding="utf-8") as f:
+        #
+        #  Most writes have no back-ticks at all, one scan of the whole
+        #  cmd avoids checking each line in that case.
+        #
+        if self.use_embedded_scripts and "`" in cmd:
             for line in lines:
-                if self.use_embedded_scripts and (btick_unescaped(line)):
+                if btick_unescaped(line):
                     raise SyntaxError(
                         "Un-escaped back-ticks can not be present in "
                         + "the generated config when\n"
                         + "embedded_scripts are used!"
                     )
-                f.write(f"{line}{eol}")
+        if self._conf_fh:
+            self._conf_fh.write("".join(f"{line}{eol}" for line in lines))
+        else:
+            #  Writes outside run(), such as from plugin display
+            with open(self.conf_file, "a", encoding="utf-8") as f:
+                f.write("".join(f"{line}{eol}" for line in lines))
+
+    @contextlib.contextmanager
+    def _conf_file_kept_open(self) -> Iterator[None]:
+        """While active, write() uses a single open handle, instead of
+        opening the config file for each call"""
+        try:
+            with open(self.conf_file, "a", encoding="utf-8") as self._conf_fh:
+                yield
+        finally:
+            self._conf_fh = None
 
     def filter_note(self, line: str):
         """Returns list of lines, if notes are not supported
@@ -486,7 +527,7 @@ class TmuxConfig:
         if (
             not line
             or line[0] == "#"
-            or line.find("-N") < 0
+            or "-N" not in line
             or (self.vers_ok("3.1") and self.use_notes_as_comments)
         ):
             return [line]
@@ -508,7 +549,7 @@ class TmuxConfig:
             note = post.split()[0]
             post = post[note_end:]
 
-        while post.find("   ") == 0:
+        while post.startswith("   "):
             post = post[1:]
         new_line = pre + post
         if self.use_notes_as_comments:
@@ -640,7 +681,7 @@ class TmuxConfig:
                 return
         # get full path notation for tmux
         cmd = self.full_path_cmd(self.tmux_bin)
-        if cmd.find(".asdf") > -1 and cmd.find("/installs/") < 0:
+        if ".asdf" in cmd and "/installs/" not in cmd:
             if not self.use_tmux_bin(cmd):
                 print(f"ERROR: asdf tmux does not seem to be valid: {cmd}")
                 sys.exit(1)
@@ -654,8 +695,8 @@ class TmuxConfig:
             self.use_tmux_bin(cmd_asdf)
 
     def full_path_cmd(self, cmd: str = "tmux") -> str:
-        c = run_shell(f"command -v {cmd}")
-        if c and c.lower().find("not found") < 0:
+        c = _command_path(cmd)
+        if c and "not found" not in c.lower():
             cmd = c
             print(f"found {cmd} in PATH")
         return cmd
@@ -666,4 +707,4 @@ class TmuxConfig:
             os.remove(self.conf_file)
 
     def is_tmate(self) -> bool:
-        return self.tmux_bin.find("tmate") > -1
+        return "tmate" in self.tmux_bin
@@ -41,6 +41,7 @@ class VersionCheck:
             print(f"Error: v_maj was not int: {self._vers}")
             raise ValueError from exc
         self.v_min, self.v_suffix = self.get_sub_vers(v_min)
+        self._is_ok_cache: dict[object, bool] = {}
 
     def get(self):
         """The version used for generating the config"""
@@ -59,6 +60,12 @@ class VersionCheck:
         param is needed. Internally version refs are always treated as
         strings.
         """
+        if vers not in self._is_ok_cache:
+            self._is_ok_cache[vers] = self._compare(vers)
+        return self._is_ok_cache[vers]
+
+    def _compare(self, vers) -> bool:
+        """Does the actual version comparison for is_ok()"""
         a, b = self.normalize_vers(vers).split(".")
 
         try:
@@ -115,7 +122,7 @@ class VersionCheck:
             #
             vers = "3.1"
 
-        if isinstance(vers, str) and vers.find(".") < 0:
+        if isinstance(vers, str) and "." not in vers:
             try:
                 vers = int(vers)
             except ValueError as err:
@@ -3,7 +3,9 @@ import os
 import pytest
 
 from src.tmux_conf.embedded_scripts import EmbeddedScripts
+from src.tmux_conf.exceptions import TmuxConfScriptEmitError
 from src.tmux_conf.utils import run_shell
+from src.tmux_conf.vers_check import VersionCheck
 
 from .utils_test import CONF_FILE
 
@@ -137,3 +139,46 @@ def not_test_es_get_dir_external_rel_conf():
     es = es_env(conf_file="tmux.conf", use_embedded_scripts=False)
     d = es.get_dir()
     assert d.endswith("/tmux/scripts")
+
+
+def es_external(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    conf_file = tmp_path / "tmux" / "tmux.conf"
+    return EmbeddedScripts(
+        conf_file=str(conf_file),
+        vers_class=VersionCheck(3.0),
+        use_embedded_scripts=False,
+    )
+
+
+def test_es_emit_error_scripts_dir(tmp_path, monkeypatch):
+    es = es_external(tmp_path, monkeypatch)
+    scripts_dir = es.get_dir()
+    os.makedirs(os.path.dirname(scripts_dir))
+    with open(scripts_dir, "w", encoding="utf-8"):
+        pass  # a file where the dir should be
+    with pytest.raises(TmuxConfScriptEmitError) as exc:
+        es.create(SCRIPT_NAME, ["true"])
+    assert exc.value.path == scripts_dir
+
+
+def test_es_emit_error_script_file(tmp_path, monkeypatch):
+    es = es_external(tmp_path, monkeypatch)
+    fname = f"{es.get_dir()}/{SCRIPT_NAME}.sh"
+    os.makedirs(fname)  # a dir where the script should be
+    with pytest.raises(TmuxConfScriptEmitError) as exc:
+        es.create(SCRIPT_NAME, ["true"])
+    assert exc.value.path == fname
+
+
+@pytest.mark.skipif(os.geteuid() == 0, reason="root ignores dir permissions")
+def test_es_emit_error_unwritable_scripts_dir(tmp_path, monkeypatch):
+    es = es_external(tmp_path, monkeypatch)
+    scripts_dir = es.get_dir()
+    os.makedirs(scripts_dir, mode=0o500)
+    try:
+        with pytest.raises(TmuxConfScriptEmitError) as exc:
+            es.create(SCRIPT_NAME, ["true"])
+        assert exc.value.path == f"{scripts_dir}/{SCRIPT_NAME}.sh"
+    finally:
+        os.chmod(scripts_dir, 0o700)
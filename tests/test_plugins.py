@@ -259,3 +259,37 @@ def test_p_display(capfd, tst_conf_file):
 #             f"Not expected target [{target}] [{len(parts)} [{target.find(wrong_dir)}]"
 #         )
 #     shutil.rmtree(target)
+
+
+def clear_env(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    conf_file = str(tmp_path / "tmux" / "tmux.conf")
+    vc = VersionCheck(3.0)
+    es = EmbeddedScripts(conf_file=conf_file, vers_class=vc, use_embedded_scripts=True)
+    return Plugins(conf_file=conf_file, vers_class=vc, es_class=es)
+
+
+def test_p_clear(tmp_path, monkeypatch):
+    plugins = clear_env(tmp_path, monkeypatch)
+    plugins_dir = plugins.get_plugin_dir()
+    assert plugins_dir == str(tmp_path / "tmux" / "plugins")
+
+    os.makedirs(os.path.join(plugins_dir, "real-plugin", "scripts"))
+    link_target = tmp_path / "linked-plugin"
+    os.makedirs(link_target / "scripts")
+    (link_target / "scripts" / "keep.sh").write_text("true\n")
+    os.symlink(link_target, os.path.join(plugins_dir, "linked-plugin"))
+    with open(os.path.join(plugins_dir, "stray-file"), "w", encoding="utf-8") as f:
+        f.write("x")
+
+    plugins.clear()
+
+    assert not os.listdir(plugins_dir)
+    #  Only the link should be gone, not what it pointed to
+    assert (link_target / "scripts" / "keep.sh").is_file()
+
+
+def test_p_clear_no_plugins_dir(tmp_path, monkeypatch):
+    plugins = clear_env(tmp_path, monkeypatch)
+    assert not os.path.exists(plugins.get_plugin_dir())
+    plugins.clear()  # nothing to clear is fine
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 from src.tmux_conf.vers_check import VersionCheck
 
@@ -141,3 +143,29 @@ def not_test_vc_normalize_vers():
 def not_test_vc_vers_bad_init():
     with pytest.raises(ValueError):
         VersionCheck("qwerty")
+
+
+def test_vc_is_ok_repeated():
+    real_compare = VersionCheck._compare
+    with mock.patch.object(
+        VersionCheck, "_compare", autospec=True, side_effect=real_compare
+    ) as compare:
+        vc = VersionCheck("3.2a")
+        for _ in range(3):
+            assert vc.is_ok("3.2a") is True
+            assert vc.is_ok(3.3) is False
+    assert compare.call_count == 2
+
+
+def test_vc_is_ok_cache_key_types():
+    #  3 and 3.0 share a dict key, "3" gets its own, all must match
+    #  what an uncached comparison gives
+    real_compare = VersionCheck._compare
+    for vers in ("2.9", "3.0", "3.1"):
+        with mock.patch.object(
+            VersionCheck, "_compare", autospec=True, side_effect=real_compare
+        ) as compare:
+            vc = VersionCheck(vers)
+            for param in (3, 3.0, "3", 3, 3.0, "3"):
+                assert vc.is_ok(param) is real_compare(vc, param)
+        assert compare.call_count == 2